@@ -3,52 +3,82 @@ AI integration module for Swabox
 """
 
 import os
-import json
+import asyncio
+import importlib.util
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from collections import OrderedDict
 from datetime import datetime
+from core import fastjson
+from core.ai_cache import LLMCache, cache_key
+from core.paths import CONFIG_PATH
+
+# Provider replies that signal a failure and must not be cached
+_FAILED_RESPONSE_PREFIXES = ("Error ", "API key not configured", "Could not process")
+
+# Prompt templates, bound to str.format so they are built with a single call
+_SUGGEST_TMPL = (
+    "Based on the following command history and context, suggest the next command:\n\n"
+    "Command History:\n{history}\n\n"
+    "Current Directory: {cwd}\n"
+    "Current Task: {task}\n\n"
+    "Suggest a command that would be helpful in this context."
+).format
+_NLP_TMPL = (
+    "Convert the following natural language request into a terminal command:\n\n"
+    "Request: {query}\n\n"
+    "Provide only the executable command without any explanation."
+).format
+
+def _create_session(headers):
+    """Create a keep-alive HTTP session with connection pooling and retries"""
+    session = requests.Session()
+    session.headers.update({
+        "Connection": "keep-alive",
+        "Content-Type": "application/json"
+    })
+    session.headers.update(headers)
+    retries = Retry(total=3, backoff_factor=0.3,
+                    status_forcelist=[429, 500, 502, 503, 504],
+                    allowed_methods=None)
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16,
+                                          max_retries=retries))
+    return session
 
 class AIProvider:
-    """Base class for AI providers"""
-    def __init__(self, config=None):
+    """
+    Base class for AI providers. Subclasses describe the API's request and
+    reply shapes through _build_payload, _extract_content, _extract_delta
+    and _wrap_content.
+    """
+    def __init__(self, config=None, cache=None):
         self.config = config or {}
-        
-    def get_suggestion(self, context):
-        """Get suggestion based on context"""
-        raise NotImplementedError("Subclasses must implement get_suggestion")
-        
-    def process_natural_language(self, query):
-        """Process natural language query"""
-        raise NotImplementedError("Subclasses must implement process_natural_language")
-
-class AnthropicProvider(AIProvider):
-    """Anthropic Claude AI provider"""
-    def __init__(self, config=None):
-        super().__init__(config)
-        self.api_key = self.config.get('api_key') or os.environ.get('ANTHROPIC_API_KEY')
-        self.api_url = "https://api.anthropic.com/v1/messages"
-        self.model = self.config.get('model', 'claude-3-haiku-20240307')
+        self.cache = cache
+        # Number of completion requests actually sent to the API
+        self.request_count = 0
         
     def get_suggestion(self, context):
         """Get command suggestion based on context"""
         if not self.api_key:
-            return "API key not configured. Please set the ANTHROPIC_API_KEY environment variable."
+            return f"API key not configured. Please set the {self.api_key_env} environment variable."
             
         try:
-            # Create prompt for command suggestion
-            prompt = f"""
-            Based on the following command history and context, suggest the next command:
-            
-            Command History:
-            {context['command_history']}
-            
-            Current Directory: {context['current_directory']}
-            Current Task: {context['current_task']}
+            prompt = self._suggestion_prompt(context)
+            response = self._call_api(prompt)
+            return self._extract_content(response) or 'No suggestion available'
             
-            Suggest a command that would be helpful in this context.
-            """
+        except Exception as e:
+            return f"Error getting suggestion: {str(e)}"
+    
+    async def aget_suggestion(self, context, session):
+        """Get command suggestion based on context using an aiohttp session"""
+        if not self.api_key:
+            return f"API key not configured. Please set the {self.api_key_env} environment variable."
             
-            response = self._call_api(prompt)
-            return response.get('content', 'No suggestion available')
+        try:
+            response = await self._acall_api(self._suggestion_prompt(context), session)
+            return self._extract_content(response) or 'No suggestion available'
             
         except Exception as e:
             return f"Error getting suggestion: {str(e)}"
@@ -56,138 +86,311 @@ class AnthropicProvider(AIProvider):
     def process_natural_language(self, query):
         """Process natural language query to executable command"""
         if not self.api_key:
-            return "API key not configured. Please set the ANTHROPIC_API_KEY environment variable."
+            return f"API key not configured. Please set the {self.api_key_env} environment variable."
             
         try:
-            # Create prompt for natural language processing
-            prompt = f"""
-            Convert the following natural language request into a terminal command:
-            
-            Request: {query}
+            prompt = self._natural_language_prompt(query)
+            response = self._call_api(prompt)
+            return self._extract_content(response) or 'Could not process the request'
             
-            Provide only the executable command without any explanation.
-            """
+        except Exception as e:
+            return f"Error processing request: {str(e)}"
+    
+    async def aprocess_natural_language(self, query, session):
+        """Process natural language query to executable command using an aiohttp session"""
+        if not self.api_key:
+            return f"API key not configured. Please set the {self.api_key_env} environment variable."
             
-            response = self._call_api(prompt)
-            return response.get('content', 'Could not process the request')
+        try:
+            response = await self._acall_api(self._natural_language_prompt(query), session)
+            return self._extract_content(response) or 'Could not process the request'
             
         except Exception as e:
             return f"Error processing request: {str(e)}"
+        
+    def stream_natural_language(self, query):
+        """
+        Process natural language query, yielding the command text as it is
+        generated. Cached answers are yielded in a single chunk.
+        The generator returns the full command when the stream completes,
+        or None when the request failed and only an error message was yielded.
+        """
+        if not self.api_key:
+            yield f"API key not configured. Please set the {self.api_key_env} environment variable."
+            return None
+            
+        prompt = self._natural_language_prompt(query)
+        data = self._build_payload(prompt)
+        cached = self._cached_response(prompt, data)
+        if cached is not None:
+            content = self._extract_content(cached)
+            yield content
+            return content
+            
+        data['stream'] = True
+        parts = []
+        try:
+            self.request_count += 1
+            with self.session.post(self.api_url, json=data, stream=True, timeout=(3.05, 30)) as response:
+                if response.status_code != 200:
+                    raise Exception(f"API call failed with status {response.status_code}: {response.text}")
+                
+                for line in response.iter_lines():
+                    if not line.startswith(b"data: "):
+                        continue
+                    payload = line[6:]
+                    if payload == b"[DONE]":
+                        break
+                    token = self._extract_delta(fastjson.loads(payload))
+                    if token:
+                        parts.append(token)
+                        yield token
+        except Exception as e:
+            # Keep the error apart from any partial command already shown
+            separator = "\n" if parts else ""
+            yield f"{separator}Error processing request: {str(e)}"
+            return None
+        
+        content = "".join(parts)
+        if content and self.cache is not None:
+            self.cache.set(cache_key(self.model, prompt, data['max_tokens']), content)
+        return content or None
+        
+    def batch_process(self, queries):
+        """Process several natural language queries in a single request"""
+        raise NotImplementedError(f"{type(self).__name__} does not support batched requests")
+        
+    def embed(self, text):
+        """Get an embedding vector for text"""
+        raise NotImplementedError(f"{type(self).__name__} does not provide embeddings")
+        
+    def _suggestion_prompt(self, context):
+        """Build the prompt for command suggestion"""
+        return _SUGGEST_TMPL(
+            history=context['command_history'],
+            cwd=context['current_directory'],
+            task=context['current_task']
+        )
+    
+    def _natural_language_prompt(self, query):
+        """Build the prompt for natural language processing"""
+        return _NLP_TMPL(query=query)
+    
+    def _cached_response(self, prompt, data):
+        """Get a cached response shaped like an API reply, or None on miss"""
+        if self.cache is None:
+            return None
+        content = self.cache.get(cache_key(self.model, prompt, data['max_tokens']))
+        return None if content is None else self._wrap_content(content)
+    
+    def _store_response(self, prompt, data, response):
+        """Cache the decoded content of an API reply"""
+        if self.cache is None:
+            return
+        content = self._extract_content(response)
+        if content is not None:
+            self.cache.set(cache_key(self.model, prompt, data['max_tokens']), content)
     
     def _call_api(self, prompt):
-        """Call the Anthropic API"""
-        headers = {
-            "Content-Type": "application/json",
-            "X-API-Key": self.api_key,
+        """Call the provider API"""
+        data = self._build_payload(prompt)
+        cached = self._cached_response(prompt, data)
+        if cached is not None:
+            return cached
+            
+        self.request_count += 1
+        response = self.session.post(self.api_url, json=data, timeout=(3.05, 30))
+        
+        if response.status_code == 200:
+            result = fastjson.loads(response.content)
+            self._store_response(prompt, data, result)
+            return result
+        else:
+            raise Exception(f"API call failed with status {response.status_code}: {response.text}")
+    
+    async def _acall_api(self, prompt, session):
+        """Call the provider API asynchronously"""
+        data = self._build_payload(prompt)
+        cached = self._cached_response(prompt, data)
+        if cached is not None:
+            return cached
+            
+        self.request_count += 1
+        async with session.post(self.api_url, json=data, headers=self.headers) as response:
+            if response.status == 200:
+                result = fastjson.loads(await response.read())
+                self._store_response(prompt, data, result)
+                return result
+            text = await response.text()
+            raise Exception(f"API call failed with status {response.status}: {text}")
+
+class AnthropicProvider(AIProvider):
+    """Anthropic Claude AI provider"""
+    def __init__(self, config=None, cache=None):
+        super().__init__(config, cache)
+        self.api_key_env = 'ANTHROPIC_API_KEY'
+        self.api_key = self.config.get('api_key') or os.environ.get(self.api_key_env)
+        self.api_url = "https://api.anthropic.com/v1/messages"
+        self.model = self.config.get('model', 'claude-3-haiku-20240307')
+        self.headers = {
+            "X-API-Key": self.api_key or "",
             "anthropic-version": "2023-06-01"
         }
+        self.session = _create_session(self.headers)
         
-        data = {
+    def _build_payload(self, prompt):
+        """Build the Anthropic request body"""
+        return {
             "model": self.model,
             "messages": [{"role": "user", "content": prompt}],
             "max_tokens": 100
         }
-        
-        response = requests.post(self.api_url, headers=headers, json=data)
-        
-        if response.status_code == 200:
-            return response.json()
-        else:
-            raise Exception(f"API call failed with status {response.status_code}: {response.text}")
+    
+    def _extract_content(self, response):
+        """Get the generated text from an Anthropic reply, joining its text blocks"""
+        content = response.get('content')
+        if content is None or isinstance(content, str):
+            return content
+        return "".join(block.get('text', '') for block in content if block.get('type') == 'text')
+    
+    def _extract_delta(self, event):
+        """Get the text from an Anthropic streaming event"""
+        if event.get('type') == 'content_block_delta':
+            return event.get('delta', {}).get('text')
+        return None
+    
+    def _wrap_content(self, content):
+        """Shape cached text like an Anthropic reply"""
+        return {"content": [{"type": "text", "text": content}]}
 
 
 class OpenAIProvider(AIProvider):
     """OpenAI GPT provider"""
-    def __init__(self, config=None):
-        super().__init__(config)
-        self.api_key = self.config.get('api_key') or os.environ.get('OPENAI_API_KEY')
+    def __init__(self, config=None, cache=None):
+        super().__init__(config, cache)
+        self.api_key_env = 'OPENAI_API_KEY'
+        self.api_key = self.config.get('api_key') or os.environ.get(self.api_key_env)
         self.api_url = "https://api.openai.com/v1/chat/completions"
+        self.completions_url = "https://api.openai.com/v1/completions"
+        self.embeddings_url = "https://api.openai.com/v1/embeddings"
         self.model = self.config.get('model', 'gpt-3.5-turbo')
+        self.completion_model = self.config.get('completion_model', 'gpt-3.5-turbo-instruct')
+        # Number of queries included in the last batch request sent
+        self.last_batch_size = 0
+        self.headers = {
+            "Authorization": f"Bearer {self.api_key}"
+        }
+        self.session = _create_session(self.headers)
         
-    def get_suggestion(self, context):
-        """Get command suggestion based on context"""
-        if not self.api_key:
-            return "API key not configured. Please set the OPENAI_API_KEY environment variable."
-            
-        try:
-            # Create prompt for command suggestion
-            prompt = f"""
-            Based on the following command history and context, suggest the next command:
-            
-            Command History:
-            {context['command_history']}
-            
-            Current Directory: {context['current_directory']}
-            Current Task: {context['current_task']}
-            
-            Suggest a command that would be helpful in this context.
-            """
-            
-            response = self._call_api(prompt)
-            return response.get('choices', [{}])[0].get('message', {}).get('content', 'No suggestion available')
-            
-        except Exception as e:
-            return f"Error getting suggestion: {str(e)}"
+    def _build_payload(self, prompt):
+        """Build the OpenAI request body"""
+        return {
+            "model": self.model,
+            "messages": [{"role": "user", "content": prompt}],
+            "max_tokens": 100,
+            "temperature": 0.5
+        }
     
-    def process_natural_language(self, query):
-        """Process natural language query to executable command"""
+    def batch_process(self, queries):
+        """
+        Process several natural language queries in one Completions API call.
+        The endpoint accepts a list of prompts and returns one choice per prompt.
+        Cached queries are answered locally and left out of the request.
+        """
+        self.last_batch_size = 0
         if not self.api_key:
-            return "API key not configured. Please set the OPENAI_API_KEY environment variable."
+            return [f"API key not configured. Please set the {self.api_key_env} environment variable."] * len(queries)
             
-        try:
-            # Create prompt for natural language processing
-            prompt = f"""
-            Convert the following natural language request into a terminal command:
-            
-            Request: {query}
-            
-            Provide only the executable command without any explanation.
-            """
-            
-            response = self._call_api(prompt)
-            return response.get('choices', [{}])[0].get('message', {}).get('content', 'Could not process the request')
+        prompts = [self._natural_language_prompt(q) for q in queries]
+        keys = [cache_key(self.completion_model, p, 100) for p in prompts]
+        results = [self.cache.get(k) if self.cache is not None else None for k in keys]
+        pending = [i for i, result in enumerate(results) if result is None]
+        if not pending:
+            return results
             
-        except Exception as e:
-            return f"Error processing request: {str(e)}"
-    
-    def _call_api(self, prompt):
-        """Call the OpenAI API"""
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {self.api_key}"
-        }
-        
         data = {
-            "model": self.model,
-            "messages": [{"role": "user", "content": prompt}],
+            "model": self.completion_model,
+            "prompt": [prompts[i] for i in pending],
             "max_tokens": 100,
             "temperature": 0.5
         }
         
-        response = requests.post(self.api_url, headers=headers, json=data)
+        self.last_batch_size = len(pending)
+        try:
+            self.request_count += 1
+            response = self.session.post(self.completions_url, json=data, timeout=(3.05, 60))
+            if response.status_code != 200:
+                raise Exception(f"API call failed with status {response.status_code}: {response.text}")
+            choices = fastjson.loads(response.content).get('choices', [])
+        except Exception as e:
+            for i in pending:
+                results[i] = f"Error processing request: {str(e)}"
+            return results
+            
+        for choice in choices:
+            i = pending[choice['index']]
+            results[i] = choice.get('text', '').strip()
+            if self.cache is not None:
+                self.cache.set(keys[i], results[i])
+        for i in pending:
+            if results[i] is None:
+                results[i] = 'Could not process the request'
+        return results
+    
+    def embed(self, text):
+        """Get an embedding vector for text from the OpenAI embeddings API"""
+        data = {"model": self.config.get('embedding_model', 'text-embedding-3-small'), "input": text}
+        response = self.session.post(self.embeddings_url, json=data, timeout=(3.05, 30))
         
         if response.status_code == 200:
-            return response.json()
+            return fastjson.loads(response.content)['data'][0]['embedding']
         else:
             raise Exception(f"API call failed with status {response.status_code}: {response.text}")
+    
+    def _extract_content(self, response):
+        """Get the generated content from an OpenAI reply"""
+        return response.get('choices', [{}])[0].get('message', {}).get('content')
+    
+    def _extract_delta(self, event):
+        """Get the text from an OpenAI streaming chunk"""
+        choices = event.get('choices') or [{}]
+        return choices[0].get('delta', {}).get('content')
+    
+    def _wrap_content(self, content):
+        """Shape cached content like an OpenAI reply"""
+        return {"choices": [{"message": {"content": content}}]}
 
 
 class AIManager:
     """Manages AI provider interactions"""
-    def __init__(self, config_path=None):
-        self.config = self._load_config(config_path)
+    def __init__(self, config_path=None, *, config=None):
+        self.config = config if config is not None else self._load_config(config_path)
         self.provider_name = self.config.get('provider', 'anthropic')
+        self.cache = LLMCache(
+            max_size=self.config.get('cache_size', 256),
+            ttl=self.config.get('cache_ttl', 3600)
+        )
+        self.cache.load()
         self.provider = self._initialize_provider()
+        self._embedding_cache = LLMCache(max_size=self.config.get('cache_size', 256), ttl=0)
+        self._embedder = None
+        self._local_model = None
+        self.semantic_cache = self._initialize_semantic_cache()
+        self._aiohttp_session = None
+        self._aiohttp_loop = None
+        self.stats = {'batch_requests': 0, 'batch_queries': 0, 'local_hits': 0}
+        # Past natural language queries mapped to the commands returned for them
+        self._answers = OrderedDict()
         
     def _load_config(self, config_path=None):
         """Load AI configuration"""
         if not config_path:
-            config_path = os.path.join(os.path.dirname(__file__), '..', 'config.json')
+            config_path = CONFIG_PATH
             
         if os.path.exists(config_path):
             try:
                 with open(config_path, 'r') as f:
-                    return json.load(f).get('ai_config', {})
+                    return fastjson.loads(f.read()).get('ai_config', {})
             except Exception:
                 pass
                 
@@ -200,9 +403,9 @@ class AIManager:
     def _initialize_provider(self):
         """Initialize the appropriate AI provider"""
         if self.provider_name.lower() == 'anthropic':
-            return AnthropicProvider(self.config)
+            return AnthropicProvider(self.config, self.cache)
         elif self.provider_name.lower() == 'openai':
-            return OpenAIProvider(self.config)
+            return OpenAIProvider(self.config, self.cache)
         else:
             raise ValueError(f"Unsupported AI provider: {self.provider_name}")
             
@@ -212,11 +415,257 @@ class AIManager:
         
     def process_natural_language(self, query):
         """Process natural language query to executable command"""
-        return self.provider.process_natural_language(query)
+        cached, embedding = self._lookup_answer(query)
+        if cached is not None:
+            return cached
+            
+        result = self.provider.process_natural_language(query)
+        self._record_answer(query, embedding, result)
+        return result
+        
+    def _lookup_answer(self, query):
+        """
+        Look a query up in the local tiers before calling the provider.
+        Returns (answer, embedding); answer is None on a miss and the
+        embedding is kept so the caller can store the provider's reply.
+        """
+        local_hit = self._local_history_match(query)
+        if local_hit is not None:
+            self.stats['local_hits'] += 1
+            return local_hit, None
+            
+        embedding = self._embed_query(query)
+        if embedding is not None:
+            cached = self.semantic_cache.get(embedding)
+            if cached is not None:
+                return cached, embedding
+        return None, embedding
+        
+    def _record_answer(self, query, embedding, result):
+        """Store a successful provider reply in the local tiers"""
+        if not isinstance(result, str) or not result or result.startswith(_FAILED_RESPONSE_PREFIXES):
+            return
+        self._remember_answer(query, result)
+        if embedding is not None:
+            self.semantic_cache.set(embedding, result)
+        
+    def _normalize_query(self, query):
+        """Normalize case and whitespace so trivially different queries compare equal"""
+        return " ".join(query.lower().split())
+        
+    def _local_history_match(self, query):
+        """
+        Get the command returned for the same query earlier, or None.
+        Only case and whitespace are normalized: fuzzy matching would reuse
+        commands generated for different targets (paths, PIDs, names).
+        """
+        return self._answers.get(self._normalize_query(query))
+        
+    def _remember_answer(self, query, result):
+        """Record the command returned for a query for later local matching"""
+        key = self._normalize_query(query)
+        self._answers[key] = result
+        self._answers.move_to_end(key)
+        while len(self._answers) > self.config.get('cache_size', 256):
+            self._answers.popitem(last=False)
+        
+    def stream_natural_language(self, query):
+        """Process natural language query, yielding the command as it is generated"""
+        cached, embedding = self._lookup_answer(query)
+        if cached is not None:
+            yield cached
+            return
+            
+        # The provider returns None when the stream did not complete
+        result = yield from self.provider.stream_natural_language(query)
+        if result is not None:
+            self._record_answer(query, embedding, result)
+        
+    def batch_process_natural_language(self, queries):
+        """
+        Process several natural language queries at once. Queries answered by
+        the local tiers are skipped; the rest use the provider's native
+        batching when available, otherwise concurrent async requests.
+        """
+        if not queries:
+            return []
+        
+        results = []
+        embeddings = []
+        for query in queries:
+            cached, embedding = self._lookup_answer(query)
+            results.append(cached)
+            embeddings.append(embedding)
+        pending = [i for i, result in enumerate(results) if result is None]
+        if not pending:
+            return results
+        
+        misses = [queries[i] for i in pending]
+        sent_before = self.provider.request_count
+        try:
+            answers = self.provider.batch_process(misses)
+            queries_sent = self.provider.last_batch_size
+        except NotImplementedError:
+            answers = asyncio.run(self.abatch(misses))
+            # Without native batching every query sent costs its own request
+            queries_sent = self.provider.request_count - sent_before
+        self.stats['batch_requests'] += self.provider.request_count - sent_before
+        self.stats['batch_queries'] += queries_sent
+        
+        for i, answer in zip(pending, answers):
+            results[i] = answer
+            self._record_answer(queries[i], embeddings[i], answer)
+        return results
+        
+    def _initialize_semantic_cache(self):
+        """Create the semantic cache if enabled in the configuration"""
+        if not self.config.get('semantic_cache', False):
+            return None
+            
+        try:
+            from core.semantic_cache import SemanticLLMCache
+        except ImportError as e:
+            print(f"Semantic cache disabled: {str(e)}")
+            return None
+            
+        self._embedder = self._resolve_embedder()
+        if self._embedder is None:
+            print("Semantic cache disabled: no embedding model available "
+                  "(install sentence-transformers or use a provider with embeddings)")
+            return None
+            
+        return SemanticLLMCache(
+            threshold=self.config.get('semantic_threshold', 0.92),
+            max_size=self.config.get('cache_size', 256)
+        )
+        
+    def _resolve_embedder(self):
+        """
+        Get the function used to embed queries: sentence-transformers locally
+        when installed, otherwise the provider's embeddings API. Returns None
+        when neither is available.
+        """
+        if importlib.util.find_spec('sentence_transformers') is not None:
+            return self._local_embed
+        if type(self.provider).embed is not AIProvider.embed:
+            return self.provider.embed
+        return None
+        
+    def _local_embed(self, text):
+        """Embed text with a local sentence-transformers model, loading it on first use"""
+        if self._local_model is None:
+            from sentence_transformers import SentenceTransformer
+            self._local_model = SentenceTransformer('all-MiniLM-L6-v2')
+        return self._local_model.encode(text)
+        
+    def _embed_query(self, query):
+        """
+        Embed a query for the semantic cache.
+        Returns None when the semantic cache is disabled or embedding fails.
+        """
+        if self.semantic_cache is None:
+            return None
+            
+        embedding = self._embedding_cache.get(query)
+        if embedding is not None:
+            return embedding
+            
+        try:
+            embedding = self._embedder(query)
+        except Exception:
+            return None
+            
+        self._embedding_cache.set(query, embedding)
+        return embedding
+        
+    def _get_aiohttp_session(self):
+        """Get the shared aiohttp session, creating it for the running event loop"""
+        loop = asyncio.get_running_loop()
+        if (self._aiohttp_session is None or self._aiohttp_session.closed
+                or self._aiohttp_loop is not loop):
+            import aiohttp
+            self._aiohttp_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=32, keepalive_timeout=75),
+                timeout=aiohttp.ClientTimeout(total=60)
+            )
+            self._aiohttp_loop = loop
+        return self._aiohttp_session
+        
+    async def aget_command_suggestion(self, context, close=True):
+        """
+        Get command suggestion based on context asynchronously.
+        The shared session is closed afterwards unless close is False.
+        """
+        try:
+            return await self.provider.aget_suggestion(context, self._get_aiohttp_session())
+        finally:
+            if close:
+                await self.aclose()
+        
+    async def aprocess_natural_language(self, query, close=True):
+        """
+        Process natural language query to executable command asynchronously.
+        The shared session is closed afterwards unless close is False.
+        """
+        try:
+            return await self.provider.aprocess_natural_language(query, self._get_aiohttp_session())
+        finally:
+            if close:
+                await self.aclose()
+        
+    async def abatch(self, queries, close=True):
+        """
+        Process several natural language queries concurrently.
+        Usage: asyncio.run(manager.abatch(["list files", "show disk usage"]))
+        The shared session is closed afterwards unless close is False.
+        """
+        session = self._get_aiohttp_session()
+        try:
+            return await asyncio.gather(
+                *(self.provider.aprocess_natural_language(q, session) for q in queries)
+            )
+        finally:
+            if close:
+                await self.aclose()
+        
+    async def aclose(self):
+        """Close the shared aiohttp session"""
+        if self._aiohttp_session is not None and not self._aiohttp_session.closed:
+            await self._aiohttp_session.close()
+        self._aiohttp_session = None
+        self._aiohttp_loop = None
+        
+    def get_cache_stats(self):
+        """Get response cache statistics as display text"""
+        stats = self.cache.stats
+        text = (f"Cache entries: {stats['size']}\n"
+                f"Hits: {stats['hits']}\n"
+                f"Misses: {stats['misses']}\n"
+                f"Hit rate: {stats['hit_rate']:.0%}")
+        if self.semantic_cache is not None:
+            text += (f"\nSemantic cache entries: {len(self.semantic_cache)}\n"
+                     f"Semantic hits: {self.semantic_cache.hits}")
+        if self.stats['local_hits']:
+            text += f"\nAnswered from query history: {self.stats['local_hits']}"
+        if self.stats['batch_queries']:
+            saved = self.stats['batch_queries'] - self.stats['batch_requests']
+            text += (f"\nBatched queries: {self.stats['batch_queries']}\n"
+                     f"Requests saved by batching: {saved}")
+        return text
+        
+    def save_cache(self):
+        """Persist the response cache to disk"""
+        try:
+            self.cache.save()
+        except Exception as e:
+            print(f"Error saving AI cache: {str(e)}")
         
     def switch_provider(self, provider_name):
         """Switch to a different AI provider"""
         self.provider_name = provider_name
         self.config['provider'] = provider_name
         self.provider = self._initialize_provider()
+        # The embedding model may change with the provider, so start a fresh semantic cache
+        self._embedding_cache.clear()
+        self.semantic_cache = self._initialize_semantic_cache()
         return f"Switched to {provider_name} provider"
\ No newline at end of file
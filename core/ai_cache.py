@@ -0,0 +1,108 @@
+"""
+Response caching for Swabox AI providers
+"""
+
+import os
+import json
+import time
+import hashlib
+from collections import OrderedDict
+from core import fastjson
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.swabox', 'llm_cache.json')
+
+def cache_key(model, prompt, max_tokens):
+    """Build a deterministic cache key for a model request"""
+    payload = json.dumps({
+        'model': model,
+        'prompt': prompt,
+        'max_tokens': max_tokens
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+class LLMCache:
+    """
+    LRU cache with per-entry expiry for decoded AI responses.
+    Entries are stored as (value, created_at) pairs keyed by cache_key().
+    """
+
+    def __init__(self, max_size=256, ttl=3600):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        """Get a cached value, or None if missing or expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        value, created_at = entry
+        if self.ttl and time.time() - created_at > self.ttl:
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key, value):
+        """Store a value, evicting the least recently used entry when full"""
+        self._entries[key] = (value, time.time())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """Remove all cached entries"""
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def stats(self):
+        """Get cache hit/miss statistics"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._entries),
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+    def load(self, path=DEFAULT_CACHE_PATH):
+        """Load unexpired entries from a JSON file"""
+        if not os.path.exists(path):
+            return
+
+        try:
+            with open(path, 'r') as f:
+                entries = fastjson.loads(f.read())
+        except Exception:
+            return
+        if not isinstance(entries, dict):
+            return
+
+        now = time.time()
+        for key, entry in entries.items():
+            # Skip entries that are not [value, created_at] pairs
+            if not isinstance(entry, (list, tuple)) or len(entry) != 2:
+                continue
+            value, created_at = entry
+            if not isinstance(created_at, (int, float)):
+                continue
+            if not self.ttl or now - created_at <= self.ttl:
+                self._entries[key] = (value, created_at)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def save(self, path=DEFAULT_CACHE_PATH):
+        """Save cached entries to a JSON file"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(fastjson.dumps(dict(self._entries)))
@@ -3,10 +3,15 @@ Swabox Core Application
 """
 
 import os
-import json
 import sys
+import atexit
+import itertools
+import time
+from collections import deque
 from datetime import datetime
+from core import fastjson
 from core.ai import AIManager
+from core.paths import CONFIG_PATH
 
 class SwaboxApp:
     """
@@ -16,28 +21,35 @@ class SwaboxApp:
     
     def __init__(self):
         self.start_time = datetime.now()
-        self.command_history = []
+        self.config = None
+        self._config_mtime = None
         self.config = self.load_config()
+        self.command_history = deque(maxlen=self.config.get('history_size', 100))
         self.ai_enabled = self.config.get('ai_enabled', False)
         self.current_directory = os.getcwd()
         self.current_task = ""
         
         # Initialize AI if enabled
+        self.ai_manager = None
         if self.ai_enabled:
             try:
-                self.ai_manager = AIManager()
+                self.ai_manager = AIManager(config=dict(self.config.get('ai_config', {})))
             except Exception as e:
                 print(f"Error initializing AI: {str(e)}")
                 self.ai_enabled = False
-        else:
-            self.ai_manager = None
+            
+        atexit.register(self.shutdown)
         
     def load_config(self):
-        """Load configuration from config file"""
-        config_path = os.path.join(os.path.dirname(__file__), '..', 'config.json')
-        if os.path.exists(config_path):
-            with open(config_path, 'r') as f:
-                return json.load(f)
+        """Load configuration from config file, reusing it if the file is unchanged"""
+        if CONFIG_PATH.exists():
+            mtime = CONFIG_PATH.stat().st_mtime
+            if self.config is not None and mtime == self._config_mtime:
+                return self.config
+            with open(CONFIG_PATH, 'r') as f:
+                config = fastjson.loads(f.read())
+            self._config_mtime = mtime
+            return config
         
         # Default configuration
         default_config = {
@@ -52,34 +64,35 @@ class SwaboxApp:
         }
         
         # Create default config file
-        os.makedirs(os.path.dirname(config_path), exist_ok=True)
-        with open(config_path, 'w') as f:
-            json.dump(default_config, f, indent=2)
+        CONFIG_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with open(CONFIG_PATH, 'w') as f:
+            f.write(fastjson.dumps(default_config, indent=True))
+        self._config_mtime = CONFIG_PATH.stat().st_mtime
             
         return default_config
     
     def save_config(self):
         """Save current configuration to config file"""
-        config_path = os.path.join(os.path.dirname(__file__), '..', 'config.json')
-        with open(config_path, 'w') as f:
-            json.dump(self.config, f, indent=2)
+        with open(CONFIG_PATH, 'w') as f:
+            f.write(fastjson.dumps(self.config, indent=True))
+        self._config_mtime = CONFIG_PATH.stat().st_mtime
+    
+    def shutdown(self):
+        """Persist application state before exit"""
+        if self.ai_manager:
+            self.ai_manager.save_cache()
     
     def add_to_history(self, command):
         """Add a command to history"""
         self.command_history.append({
             'command': command,
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': time.time(),
             'directory': self.current_directory
         })
-        
-        # Trim history if it exceeds the maximum size
-        max_history = self.config.get('history_size', 100)
-        if len(self.command_history) > max_history:
-            self.command_history = self.command_history[-max_history:]
     
     def get_history(self):
         """Get command history"""
-        return self.command_history
+        return list(self.command_history)
     
     def get_uptime(self):
         """Get application uptime"""
@@ -87,12 +100,14 @@ class SwaboxApp:
     
     def toggle_ai(self):
         """Toggle AI features on/off"""
+        # Pick up external edits to the config file before saving over it
+        self.config = self.load_config()
         self.ai_enabled = not self.ai_enabled
         self.config['ai_enabled'] = self.ai_enabled
         
         if self.ai_enabled and not self.ai_manager:
             try:
-                self.ai_manager = AIManager()
+                self.ai_manager = AIManager(config=dict(self.config.get('ai_config', {})))
             except Exception as e:
                 print(f"Error initializing AI: {str(e)}")
                 self.ai_enabled = False
@@ -111,16 +126,56 @@ class SwaboxApp:
             return "AI is not enabled. Use 'ai on' to enable AI features."
             
         context = {
-            'command_history': self.command_history[-10:] if self.command_history else [],
-            'current_directory': self.current_directory,
+            'command_history': self._format_history_context(),
+            'current_directory': self._abbreviate_path(self.current_directory),
             'current_task': self.current_task
         }
         
         return self.ai_manager.get_command_suggestion(context)
     
+    def _format_history_context(self, limit=10):
+        """
+        Format the most recent commands for an AI prompt, one per line.
+        Oldest commands are dropped until the text fits ai_context_tokens,
+        estimated at four characters per token.
+        """
+        commands = [entry['command'] for entry in itertools.islice(
+            self.command_history, max(0, len(self.command_history) - limit), None
+        )]
+        
+        budget = self.config.get('ai_context_tokens', 512) * 4
+        size = sum(len(command) + 1 for command in commands)
+        start = 0
+        while start < len(commands) and size > budget:
+            size -= len(commands[start]) + 1
+            start += 1
+            
+        return "\n".join(commands[start:])
+    
+    def _abbreviate_path(self, path):
+        """Shorten a path by replacing the home directory with ~"""
+        home = os.path.expanduser('~')
+        if path == home or path.startswith(home + os.sep):
+            return '~' + path[len(home):]
+        return path
+    
     def process_natural_language(self, query):
         """Process natural language query to executable command"""
         if not self.ai_enabled or not self.ai_manager:
             return "AI is not enabled. Use 'ai on' to enable AI features."
             
-        return self.ai_manager.process_natural_language(query)
\ No newline at end of file
+        return self.ai_manager.process_natural_language(query)
+    
+    def stream_natural_language(self, query):
+        """Process natural language query, yielding the command as it is generated"""
+        if not self.ai_enabled or not self.ai_manager:
+            return iter(["AI is not enabled. Use 'ai on' to enable AI features."])
+            
+        return self.ai_manager.stream_natural_language(query)
+    
+    def batch_process_natural_language(self, queries):
+        """Process several natural language queries to executable commands"""
+        if not self.ai_enabled or not self.ai_manager:
+            return "AI is not enabled. Use 'ai on' to enable AI features."
+            
+        return self.ai_manager.batch_process_natural_language(queries)
\ No newline at end of file
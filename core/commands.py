@@ -3,11 +3,64 @@ Command processing module for Swabox
 """
 
 import os
+import difflib
+import functools
+import pathlib
 import platform
 import subprocess
 from datetime import datetime
-import importlib
+import importlib.util
+import re
 import sys
+from core.paths import PROJECT_ROOT
+from terminal.ui import clear_screen, stream_message, stream_output
+
+# Plugins are discovered by scanning the start of each file, not by importing it
+_PLUGIN_HEADER_SIZE = 2048
+_COMMAND_NAME_RE = re.compile(r"""^command_name\s*=\s*["'](\w+)["']""", re.MULTILINE)
+_DOCSTRING_RE = re.compile(r"""\s*('''|\"\"\")(.*?)\1""", re.DOTALL)
+
+@functools.lru_cache(maxsize=None)
+def _system_info():
+    """Build the system information text once; it cannot change at runtime"""
+    return (f"Operating System: {platform.system()} {platform.release()}\n"
+            f"Architecture: {platform.machine()}\n"
+            f"Python Version: {platform.python_version()}\n"
+            f"Processor: {platform.processor()}\n")
+
+class _LazyPlugin:
+    """
+    Placeholder for a plugin module that is imported on first use.
+    Exposes the module docstring read from the file header for help text.
+    """
+    
+    def __init__(self, module_name, path, doc=None):
+        self.module_name = module_name
+        self.path = path
+        self.__doc__ = doc
+        self._module = None
+    
+    @property
+    def module(self):
+        """Import the plugin module if it has not been loaded yet"""
+        if self._module is None:
+            name = f"swabox_plugins.{self.module_name}"
+            module = sys.modules.get(name)
+            if module is None:
+                spec = importlib.util.spec_from_file_location(name, self.path)
+                module = importlib.util.module_from_spec(spec)
+                sys.modules[name] = module
+                try:
+                    spec.loader.exec_module(module)
+                except BaseException:
+                    del sys.modules[name]
+                    raise
+            self._module = module
+        return self._module
+    
+    def run(self, args):
+        """Run the plugin command"""
+        return self.module.run(args)
 
 class CommandProcessor:
     """
@@ -28,16 +81,20 @@ class CommandProcessor:
             'system': self.cmd_system,
             'ai': self.cmd_ai,
             'ask': self.cmd_ask,
+            'ask_batch': self.cmd_ask_batch,
             'task': self.cmd_task,
             'suggest': self.cmd_suggest,
             'cd': self.cmd_cd
         }
+        self.builtin_commands_sorted = sorted(self.builtin_commands)
         self.plugins = self.load_plugins()
+        # Help text only changes with plugins; set to None to rebuild on next help
+        self._help_cache = self._build_help_text()
     
     def load_plugins(self, plugin_folder="plugins"):
-        """Load command plugins from the plugins directory"""
+        """Discover command plugins in the plugins directory without importing them"""
         plugins = {}
-        plugin_path = os.path.join(os.path.dirname(__file__), '..', plugin_folder)
+        plugin_path = os.path.join(PROJECT_ROOT, plugin_folder)
         
         if not os.path.exists(plugin_path):
             os.makedirs(plugin_path)
@@ -45,15 +102,20 @@ class CommandProcessor:
             
         for filename in os.listdir(plugin_path):
             if filename.endswith(".py") and not filename.startswith("__"):
-                module_name = filename[:-3]
+                path = os.path.join(plugin_path, filename)
                 try:
-                    sys.path.append(plugin_path)
-                    module = importlib.import_module(module_name)
-                    if hasattr(module, 'command_name') and hasattr(module, 'run'):
-                        plugins[module.command_name] = module
-                    sys.path.pop()
-                except ImportError as e:
-                    print(f"Error loading plugin {module_name}: {e}")
+                    with open(path, 'r', encoding='utf-8') as f:
+                        header = f.read(_PLUGIN_HEADER_SIZE)
+                except OSError as e:
+                    print(f"Error loading plugin {filename[:-3]}: {e}")
+                    continue
+                    
+                match = _COMMAND_NAME_RE.search(header)
+                if match:
+                    doc = _DOCSTRING_RE.match(header)
+                    plugins[match.group(1)] = _LazyPlugin(
+                        filename[:-3], path, doc.group(2) if doc else None
+                    )
         return plugins
     
     def process(self, command_str):
@@ -62,10 +124,21 @@ class CommandProcessor:
         if self.app:
             self.app.add_to_history(command_str)
         
+        command_str = command_str.strip()
+        
+        # Handle shell commands before any parsing
+        if command_str.startswith('!'):
+            if self.app and self.app.config.get('shell_stream', False):
+                return self.stream_shell_command(command_str[1:])
+            return self.execute_shell_command(command_str[1:])
+        
+        # Try AI natural language processing if enabled
+        if command_str.startswith('?') and self.app and self.app.ai_enabled:
+            return self.process_natural_language(command_str[1:])
+        
         # Split the command and arguments
-        parts = command_str.strip().split(' ', 1)
-        command = parts[0].lower()
-        args = parts[1] if len(parts) > 1 else ""
+        head, _, args = command_str.partition(' ')
+        command = head.casefold()
         
         # Check if it's a built-in command
         if command in self.builtin_commands:
@@ -78,19 +151,16 @@ class CommandProcessor:
             except Exception as e:
                 return f"Error executing plugin command: {str(e)}"
         
-        # Handle shell commands
-        elif command.startswith('!'):
-            return self.execute_shell_command(command_str[1:])
-        
-        # Try AI natural language processing if enabled
-        elif self.app and self.app.ai_enabled and command.startswith('?'):
-            return self.process_natural_language(command_str[1:])
-        
         # Unknown command
         else:
-            # Get AI suggestion if enabled
+            # Suggest similar known commands locally before asking the AI
+            matches = difflib.get_close_matches(
+                command, self.builtin_commands_sorted + sorted(self.plugins), n=3, cutoff=0.6
+            )
             suggestion = ""
-            if self.app and self.app.ai_enabled:
+            if matches:
+                suggestion = "\n\nDid you mean one of these?\n" + "\n".join(f"  {m}" for m in matches)
+            elif self.app and self.app.ai_enabled:
                 suggestion = f"\n\nDid you mean one of these?\n{self.app.get_ai_suggestion()}"
             
             return f"Unknown command: {command}. Type 'help' for available commands.{suggestion}"
@@ -98,42 +168,70 @@ class CommandProcessor:
     def execute_shell_command(self, shell_command):
         """Execute a shell command and return the output"""
         try:
-            result = subprocess.run(shell_command, shell=True, 
-                                  capture_output=True, text=True)
-            return result.stdout if result.stdout else f"Command executed. {result.stderr}"
+            result = subprocess.run(shell_command, shell=True,
+                                  stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            if result.stdout:
+                return result.stdout.decode('utf-8', errors='replace')
+            stderr = result.stderr.decode('utf-8', errors='replace') if result.stderr else ''
+            return f"Command executed. {stderr}"
         except Exception as e:
             return f"Error executing shell command: {str(e)}"
     
+    def stream_shell_command(self, shell_command):
+        """Execute a shell command, displaying its output as it is produced"""
+        try:
+            process = subprocess.Popen(shell_command, shell=True,
+                                       stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        except Exception as e:
+            return f"Error executing shell command: {str(e)}"
+            
+        with process:
+            lines = (line.decode('utf-8', errors='replace')
+                     for line in iter(process.stdout.readline, b''))
+            stream_output(lines)
+        return ""
+    
     def process_natural_language(self, query):
         """Process natural language query to executable command"""
         if not self.app or not self.app.ai_enabled:
             return "AI features are not enabled. Use 'ai on' to enable."
         
+        if self.app.config.get('ai_stream', False):
+            stream_message(self.app.stream_natural_language(query), style="command")
+            return ""
+        
         return self.app.process_natural_language(query)
     
-    # Built-in commands
-    def cmd_help(self, args):
-        """Display available commands"""
-        help_text = "Available commands:\n"
-        help_text += "\nBuilt-in commands:\n"
-        for cmd in sorted(self.builtin_commands.keys()):
-            doc = self.builtin_commands[cmd].__doc__ or "No description"
-            help_text += f"  {cmd} - {doc}\n"
+    def _build_help_text(self):
+        """Build the help listing for built-in and plugin commands"""
+        parts = ["Available commands:", "", "Built-in commands:"]
+        parts.extend(f"  {cmd} - {self.builtin_commands[cmd].__doc__ or 'No description'}"
+                     for cmd in self.builtin_commands_sorted)
         
-        help_text += "\nPlugin commands:\n"
-        for cmd in sorted(self.plugins.keys()):
-            doc = self.plugins[cmd].__doc__ or "No description"
-            help_text += f"  {cmd} - {doc}\n"
+        parts.extend(["", "Plugin commands:"])
+        parts.extend(f"  {cmd} - {self.plugins[cmd].__doc__ or 'No description'}"
+                     for cmd in sorted(self.plugins))
         
-        help_text += "\nSpecial syntax:\n"
-        help_text += "  !<command> - Execute shell command\n"
-        help_text += "  ?<query> - Natural language query (when AI enabled)\n"
+        parts.extend([
+            "",
+            "Special syntax:",
+            "  !<command> - Execute shell command",
+            "  ?<query> - Natural language query (when AI enabled)",
+            ""
+        ])
         
-        return help_text
+        return "\n".join(parts)
+    
+    # Built-in commands
+    def cmd_help(self, args):
+        """Display available commands"""
+        if self._help_cache is None:
+            self._help_cache = self._build_help_text()
+        return self._help_cache
     
     def cmd_clear(self, args):
         """Clear the screen"""
-        os.system('cls' if os.name == 'nt' else 'clear')
+        clear_screen()
         return ""
     
     def cmd_history(self, args):
@@ -145,13 +243,13 @@ class CommandProcessor:
         if not history:
             return "No command history."
             
-        history_text = "Command History:\n"
+        parts = ["Command History:"]
         for i, entry in enumerate(history, 1):
-            cmd = entry['command']
-            timestamp = datetime.fromisoformat(entry['timestamp']).strftime("%Y-%m-%d %H:%M:%S")
-            history_text += f"{i}. [{timestamp}] {cmd}\n"
+            timestamp = datetime.fromtimestamp(entry['timestamp']).strftime("%Y-%m-%d %H:%M:%S")
+            parts.append(f"{i}. [{timestamp}] {entry['command']}")
+        parts.append("")
             
-        return history_text
+        return "\n".join(parts)
     
     def cmd_echo(self, args):
         """Display the provided text"""
@@ -167,26 +265,25 @@ class CommandProcessor:
     
     def cmd_info(self, args):
         """Display information about Swabox"""
-        info = "Swabox: AI-Enhanced Terminal\n"
-        info += "Version: 0.1.0\n"
-        info += "Description: Modern terminal with AI capabilities\n"
+        parts = [
+            "Swabox: AI-Enhanced Terminal",
+            "Version: 0.1.0",
+            "Description: Modern terminal with AI capabilities"
+        ]
         
         if self.app:
             uptime = self.app.get_uptime()
             hours, remainder = divmod(uptime.total_seconds(), 3600)
             minutes, seconds = divmod(remainder, 60)
-            info += f"Uptime: {int(hours)}h {int(minutes)}m {int(seconds)}s\n"
-            info += f"AI Features: {'Enabled' if self.app.ai_enabled else 'Disabled'}\n"
+            parts.append(f"Uptime: {int(hours)}h {int(minutes)}m {int(seconds)}s")
+            parts.append(f"AI Features: {'Enabled' if self.app.ai_enabled else 'Disabled'}")
+        parts.append("")
             
-        return info
+        return "\n".join(parts)
     
     def cmd_system(self, args):
         """Display system information"""
-        system_info = f"Operating System: {platform.system()} {platform.release()}\n"
-        system_info += f"Architecture: {platform.machine()}\n"
-        system_info += f"Python Version: {platform.python_version()}\n"
-        system_info += f"Processor: {platform.processor()}\n"
-        return system_info
+        return _system_info()
         
     def cmd_ai(self, args):
         """Toggle AI features or interact with AI"""
@@ -195,7 +292,7 @@ class CommandProcessor:
             
         if not args:
             status = "enabled" if self.app.ai_enabled else "disabled"
-            return f"AI features are currently {status}. Usage: ai [on|off|ask <query>|provider <name>]"
+            return f"AI features are currently {status}. Usage: ai [on|off|ask <query>|provider <name>|stats]"
         
         if args.lower() == "on":
             result = self.app.toggle_ai()
@@ -215,8 +312,12 @@ class CommandProcessor:
             if provider not in ["anthropic", "openai"]:
                 return "Supported providers: anthropic, openai"
             return self.app.ai_manager.switch_provider(provider)
+        elif args.lower() == "stats":
+            if not self.app.ai_manager:
+                return "AI features are not enabled. Use 'ai on' to enable."
+            return self.app.ai_manager.get_cache_stats()
         else:
-            return "Invalid AI command. Usage: ai [on|off|ask <query>|provider <name>]"
+            return "Invalid AI command. Usage: ai [on|off|ask <query>|provider <name>|stats]"
     
     def cmd_ask(self, args):
         """Process natural language query"""
@@ -226,7 +327,31 @@ class CommandProcessor:
         if not self.app or not self.app.ai_enabled:
             return "AI features are not enabled. Use 'ai on' to enable."
             
-        return self.app.process_natural_language(args)
+        return self.process_natural_language(args)
+    
+    def cmd_ask_batch(self, args):
+        """Process natural language queries from a file, one per line"""
+        if not args:
+            return "Usage: ask_batch <file>"
+        
+        if not self.app or not self.app.ai_enabled:
+            return "AI features are not enabled. Use 'ai on' to enable."
+            
+        try:
+            with open(os.path.expanduser(args.strip()), 'r') as f:
+                queries = [line.strip() for line in f if line.strip()]
+        except FileNotFoundError:
+            return f"File not found: {args}"
+        except Exception as e:
+            return f"Error reading file: {str(e)}"
+            
+        if not queries:
+            return "No queries found in file."
+            
+        results = self.app.batch_process_natural_language(queries)
+        if isinstance(results, str):
+            return results
+        return "\n".join(f"{query} -> {result}" for query, result in zip(queries, results))
     
     def cmd_task(self, args):
         """Set the current task description"""
@@ -251,7 +376,8 @@ class CommandProcessor:
     def cmd_cd(self, args):
         """Change directory"""
         if not args:
-            return "Current directory: " + os.getcwd()
+            current = self.app.current_directory if self.app else os.getcwd()
+            return "Current directory: " + current
             
         try:
             # Handle ~ expansion for home directory
@@ -259,12 +385,23 @@ class CommandProcessor:
                 args = os.path.expanduser(args)
                 
             os.chdir(args)
+            current = self._resolve_directory(args)
             if self.app:
-                self.app.current_directory = os.getcwd()
-            return "Changed directory to: " + os.getcwd()
+                self.app.current_directory = current
+            return "Changed directory to: " + current
         except FileNotFoundError:
             return f"Directory not found: {args}"
         except PermissionError:
             return f"Permission denied: {args}"
         except Exception as e:
-            return f"Error changing directory: {str(e)}"
\ No newline at end of file
+            return f"Error changing directory: {str(e)}"
+    
+    def _resolve_directory(self, path):
+        """
+        Get the working directory after a successful chdir(path). Joins the
+        path onto the cached directory instead of calling getcwd, except for
+        '..' components, which only the OS can resolve correctly through symlinks.
+        """
+        if not self.app or '..' in pathlib.PurePath(path).parts:
+            return os.getcwd()
+        return os.path.normpath(os.path.join(self.app.current_directory, path))
\ No newline at end of file
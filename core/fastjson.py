@@ -0,0 +1,22 @@
+"""
+JSON helpers for Swabox that use orjson when it is installed
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def loads(data):
+    """Parse JSON from str or bytes"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def dumps(obj, indent=False):
+    """Serialize obj to a JSON string, optionally indented by two spaces"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode()
+    return json.dumps(obj, indent=2 if indent else None)
@@ -0,0 +1,8 @@
+"""
+Filesystem locations used by Swabox
+"""
+
+import pathlib
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parent.parent
+CONFIG_PATH = PROJECT_ROOT / "config.json"
@@ -0,0 +1,64 @@
+"""
+Embedding-based response cache for Swabox natural language queries
+"""
+
+import numpy as np
+
+class SemanticLLMCache:
+    """
+    Cache that returns a stored response when a new query embedding is
+    close enough (cosine similarity) to a previously answered one.
+    Embeddings are kept as float32 rows in a fixed-size ring buffer.
+    """
+
+    def __init__(self, threshold=0.92, max_size=256):
+        self.threshold = threshold
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._embeddings = None
+        self._norms = np.zeros(max_size, dtype=np.float32)
+        self._responses = [None] * max_size
+        self._count = 0
+        self._next = 0
+
+    def get(self, embedding):
+        """Get the response for the most similar stored query, or None"""
+        if not self._count:
+            self.misses += 1
+            return None
+
+        query = np.asarray(embedding, dtype=np.float32)
+        query_norm = np.linalg.norm(query)
+        if not query_norm:
+            self.misses += 1
+            return None
+
+        n = self._count
+        sims = (self._embeddings[:n] @ query) / (self._norms[:n] * query_norm)
+        best = int(np.argmax(sims))
+        if sims[best] > self.threshold:
+            self.hits += 1
+            return self._responses[best]
+
+        self.misses += 1
+        return None
+
+    def set(self, embedding, response):
+        """Store a response for a query embedding, replacing the oldest when full"""
+        vector = np.asarray(embedding, dtype=np.float32)
+        if self._embeddings is None:
+            self._embeddings = np.zeros((self.max_size, vector.shape[0]), dtype=np.float32)
+
+        norm = np.linalg.norm(vector)
+        if not norm:
+            return
+
+        self._embeddings[self._next] = vector
+        self._norms[self._next] = norm
+        self._responses[self._next] = response
+        self._next = (self._next + 1) % self.max_size
+        self._count = min(self._count + 1, self.max_size)
+
+    def __len__(self):
+        return self._count
@@ -2,12 +2,71 @@
 Weather information plugin for Swabox
 """
 
-import requests
+import os
 import json
+import time
+import functools
 
 # Define command name that will be used to invoke this plugin
 command_name = "weather"
 
+API_URL = "https://api.openweathermap.org/data/2.5/weather"
+
+# Weather data is reused within 10-minute windows
+CACHE_SECONDS = 600
+CACHE_PATH = os.path.join(os.path.expanduser('~'), '.swabox', 'weather_cache.json')
+
+# HTTP client shared by all requests, created on first use
+_client = None
+
+def _get_client():
+    """Get the shared HTTP client, importing httpx only when weather is requested"""
+    global _client
+    if _client is None:
+        import httpx
+        headers = {"User-Agent": "swabox/0.1"}
+        try:
+            _client = httpx.Client(http2=True, timeout=5.0, headers=headers)
+        except ImportError:
+            # HTTP/2 needs the optional h2 package
+            _client = httpx.Client(timeout=5.0, headers=headers)
+    return _client
+
+def _read_disk_cache():
+    """Load cached weather data from disk"""
+    try:
+        with open(CACHE_PATH, 'r') as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+def _write_disk_cache(cache):
+    """Save cached weather data to disk"""
+    try:
+        os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+        with open(CACHE_PATH, 'w') as f:
+            json.dump(cache, f)
+    except Exception:
+        pass
+
+@functools.lru_cache(maxsize=128)
+def _fetch(city, slot, api_key):
+    """Fetch weather data for a city, reusing data from the same time slot"""
+    cache = _read_disk_cache()
+    entry = cache.get(city)
+    if entry and entry[0] == slot:
+        return entry[1]
+
+    response = _get_client().get(API_URL, params={"q": city, "appid": api_key, "units": "metric"})
+    response.raise_for_status()
+    data = response.json()
+
+    # Keep only entries from the current slot so the file does not grow
+    cache = {name: entry for name, entry in cache.items() if entry[0] == slot}
+    cache[city] = [slot, data]
+    _write_disk_cache(cache)
+    return data
+
 def run(args):
     """
     Get weather information for a specified location
@@ -15,25 +74,33 @@ def run(args):
     """
     if not args:
         return "Usage: weather <city>"
-        
+
     city = args.strip()
-    
+
     try:
         # Using OpenWeatherMap API as an example
-        # In a real implementation, you would use your API key
-        # and proper error handling
-        api_key = "YOUR_API_KEY"  # Replace with actual API key
-        url = f"https://api.openweathermap.org/data/2.5/weather?q={city}&appid={api_key}&units=metric"
-        
-        # For demo purposes, return a mock response
-        return f"""
+        # Set OPENWEATHER_API_KEY or replace the key below to get real data
+        api_key = os.environ.get('OPENWEATHER_API_KEY', "YOUR_API_KEY")
+
+        if api_key == "YOUR_API_KEY":
+            # For demo purposes, return a mock response
+            return f"""
 Weather information for {city}:
 - Temperature: 22°C
 - Conditions: Partly Cloudy
 - Humidity: 65%
 - Wind: 12 km/h
 
-Note: This is mock data. To get real weather data, replace the API key in the plugin.
+Note: This is mock data. To get real weather data, set the OPENWEATHER_API_KEY environment variable.
+"""
+
+        data = _fetch(city.lower(), int(time.time() // CACHE_SECONDS), api_key)
+        return f"""
+Weather information for {city}:
+- Temperature: {data['main']['temp']:.0f}°C
+- Conditions: {data['weather'][0]['description'].capitalize()}
+- Humidity: {data['main']['humidity']}%
+- Wind: {data['wind']['speed'] * 3.6:.0f} km/h
 """
     except Exception as e:
-        return f"Error getting weather information: {str(e)}"
\ No newline at end of file
+        return f"Error getting weather information: {str(e)}"
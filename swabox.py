@@ -148,7 +148,7 @@ class CommandProcessor:
         history_text = "Command History:\n"
         for i, entry in enumerate(history, 1):
             cmd = entry['command']
-            timestamp = datetime.fromisoformat(entry['timestamp']).strftime("%Y-%m-%d %H:%M:%S")
+            timestamp = datetime.fromtimestamp(entry['timestamp']).strftime("%Y-%m-%d %H:%M:%S")
             history_text += f"{i}. [{timestamp}] {cmd}\n"
             
         return history_text
@@ -5,7 +5,7 @@ Input handler module for Swabox
 from prompt_toolkit import PromptSession
 from prompt_toolkit.completion import WordCompleter
 from prompt_toolkit.styles import Style
-from prompt_toolkit.history import InMemoryHistory
+from prompt_toolkit.history import InMemoryHistory, DummyHistory
 
 # Session history
 history = InMemoryHistory()
@@ -21,29 +21,43 @@ default_commands = [
     'time', 'info', 'system', 'ai'
 ]
 
+# Sessions are created on first use and reused for every prompt
+_session = None
+_plain_session = None
+
+# Completers keyed by the tuple of extra commands
+_completers = {}
+
+def _get_completer(commands):
+    """Get a cached completer for the default commands plus any additional commands"""
+    key = tuple(commands or ())
+    completer = _completers.get(key)
+    if completer is None:
+        completer = WordCompleter(default_commands + list(key), ignore_case=True)
+        _completers[key] = completer
+    return completer
+
+def _get_plain_session():
+    """Get the shared session for prompts that must not be kept in history"""
+    global _plain_session
+    if _plain_session is None:
+        _plain_session = PromptSession(history=DummyHistory())
+    return _plain_session
+
 def get_user_input(prompt="swabox> ", commands=None):
     """Get user input with command completion"""
-    # Create a completer with default commands plus any additional commands
-    all_commands = default_commands + (commands or [])
-    command_completer = WordCompleter(all_commands, ignore_case=True)
-    
-    # Create a session with history and completer
-    session = PromptSession(
-        history=history,
-        completer=command_completer,
-        style=style
-    )
+    global _session
+    if _session is None:
+        _session = PromptSession(history=history, style=style)
     
-    # Get input
-    return session.prompt(prompt)
+    return _session.prompt(prompt, completer=_get_completer(commands))
 
 def get_password(prompt="Password: "):
     """Get password input (masked)"""
-    session = PromptSession()
-    return session.prompt(prompt, is_password=True)
+    return _get_plain_session().prompt(prompt, is_password=True)
 
 def get_confirmation(prompt="Are you sure? (y/n): "):
     """Get yes/no confirmation"""
-    session = PromptSession()
-    response = session.prompt(prompt).lower()
+    # prompt() arguments persist on a session, so undo a previous password prompt
+    response = _get_plain_session().prompt(prompt, is_password=False).lower()
     return response.startswith('y')
\ No newline at end of file
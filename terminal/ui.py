@@ -7,7 +7,8 @@ from rich.theme import Theme
 from rich.syntax import Syntax
 from rich.panel import Panel
 from rich.table import Table
-import os
+from rich.live import Live
+from rich.text import Text
 
 # Define a custom theme
 custom_theme = Theme({
@@ -42,6 +43,20 @@ def display_table(title, columns, data):
     
     console.print(table)
 
+def stream_message(chunks, style="info"):
+    """Display text as it arrives from an iterable of chunks and return the full text"""
+    text = ""
+    with Live(Text("", style=style), console=console, refresh_per_second=20) as live:
+        for chunk in chunks:
+            text += chunk
+            live.update(Text(text, style=style))
+    return text
+
+def stream_output(chunks):
+    """Print raw output chunks as they arrive, without markup or highlighting"""
+    for chunk in chunks:
+        console.out(chunk, end="", highlight=False)
+
 def clear_screen():
     """Clear the terminal screen"""
-    os.system('cls' if os.name == 'nt' else 'clear')
\ No newline at end of file
+    console.clear()
\ No newline at end of file